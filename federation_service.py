@@ -10,39 +10,77 @@ MCP-compliant knowledge synchronization with conflict resolution.
 - Implements conflict resolution with confidence scoring
 - Error recovery with omnilore_query for guidance
 - No direct ChromaDB or API calls
+
+register_sync(..., background=True) hands its MCP store to a background
+task. Callers using it must await flush_stores() before the event loop
+closes; stores still queued then are dropped (with a RuntimeWarning).
 """
 
+import asyncio
+import contextlib
 import json
+import time
+import warnings
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
-from dataclasses import dataclass
+from typing import Deque, Dict, List, Any, NamedTuple, Optional
+
+try:
+    from .federation_types import ConflictResolver, KnowledgeSync  # noqa: F401
+    from .phase5_io import (
+        atomic_write_bytes,
+        flush_on_exit,
+        json_dumps,
+        json_loads,
+        ns_to_iso,
+    )
+except ImportError:  # Loaded as a top-level module / script
+    from federation_types import ConflictResolver, KnowledgeSync  # noqa: F401
+    from phase5_io import (
+        atomic_write_bytes,
+        flush_on_exit,
+        json_dumps,
+        json_loads,
+        ns_to_iso,
+    )
+
+# Exact direction keys, as built by f"{source} → {target}" on every sync
+DIR_O2X = "omnilore → oxproxion"
+DIR_X2O = "oxproxion → omnilore"
 
+# Number of recent sync events kept in memory and in the state file
+SYNC_HISTORY_LIMIT = 100
 
-@dataclass
-class KnowledgeSync:
-    """Represents a synchronized knowledge entry."""
 
-    id: str
-    source_repo: str  # 'omnilore' or 'oxproxion'
-    category: str
-    confidence: float
-    created_at: str
-    last_synced: str
-    sync_count: int = 0
+def _iso_to_ns(ts: str) -> int:
+    """Parse an ISO-8601 string (naive means local time) into epoch ns."""
+    return int(datetime.fromisoformat(ts).timestamp() * 1e9)
+
+
+class SyncEvent(NamedTuple):
+    """One sync event; direction_id indexes FederationService's table."""
+
+    ts_ns: int  # time.time_ns(); formatted to ISO only on output
+    entry_id: str
+    direction_id: int
 
 
 class FederationService:
     """Manage bidirectional federation via MCP (MCP-First compliant)."""
 
-    def __init__(self, omnilore_client=None, state_file: str = None):
+    def __init__(
+        self, omnilore_client=None, state_file: str = None, pretty: bool = False
+    ):
         """Initialize federation service with MCP client.
 
         Args:
             omnilore_client: OmniLore MCP client (auto-configured if None)
             state_file: Path to store federation state (sync history)
+            pretty: Indent the state file for humans (compact by default)
         """
         self.omnilore_client = omnilore_client
+        self.pretty = pretty
 
         if state_file is None:
             state_file = Path(__file__).parent / "federation_state.json"
@@ -50,59 +88,201 @@ class FederationService:
             state_file = Path(state_file)
 
         self.state_file = state_file
-        self.sync_history: List[Dict[str, Any]] = []
+        self.sync_history: Deque[SyncEvent] = deque(maxlen=SYNC_HISTORY_LIMIT)
+        # Interned "source → target" strings; counts are indexed the same way
+        self._direction_table: List[str] = []
+        self._direction_ids: Dict[str, int] = {}
+        self._dir_counts: List[int] = []
+        self._dirty = False
+        # Background MCP stores for register_sync (started on first use)
+        self._store_queue: Optional[asyncio.Queue] = None
+        self._store_task: Optional[asyncio.Task] = None
         self._load_state()
 
+        # Sync events are buffered in memory; make sure they hit disk on exit
+        flush_on_exit(self)
+
     def _load_state(self) -> None:
         """Load previous sync state from disk."""
         if self.state_file.exists():
-            with open(self.state_file) as f:
-                data = json.load(f)
-                self.sync_history = data.get("syncs", [])
+            data = json_loads(self.state_file.read_bytes())
+            for s in data.get("syncs", [])[-SYNC_HISTORY_LIMIT:]:
+                if "d" in s:
+                    ts, entry_id, direction = s["t"], s["e"], s["d"]
+                else:
+                    # Records written before the compact t/e/d layout
+                    ts = s.get("timestamp")
+                    entry_id = s.get("entry_id")
+                    direction = s.get("direction", "")
+                try:
+                    ts_ns = _iso_to_ns(ts)
+                except (TypeError, ValueError):
+                    continue  # Unreadable timestamp; drop the record
+                self.sync_history.append(
+                    SyncEvent(ts_ns, entry_id, self._direction_id(direction))
+                )
+
+            if "dir_counts" in data:
+                for direction, count in data["dir_counts"].items():
+                    self._dir_counts[self._direction_id(direction)] = count
+            else:
+                # Older state files predate the persisted counters;
+                # rebuild them from the kept history in a single pass
+                for event in self.sync_history:
+                    self._dir_counts[event.direction_id] += 1
 
     def _save_state(self) -> None:
         """Save sync state to disk."""
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.state_file, "w") as f:
-            json.dump(
+        table = self._direction_table
+        atomic_write_bytes(
+            self.state_file,
+            json_dumps(
                 {
-                    "last_sync": datetime.now().isoformat(),
-                    "sync_count": len(self.sync_history),
-                    "syncs": self.sync_history[-100:],  # Keep last 100
+                    "last_sync": ns_to_iso(time.time_ns()),
+                    "sync_count": sum(self._dir_counts),
+                    "syncs": [
+                        {
+                            "t": ns_to_iso(ts_ns),
+                            "e": entry_id,
+                            "d": table[direction_id],
+                        }
+                        for ts_ns, entry_id, direction_id in self.sync_history
+                    ],
+                    "dir_counts": dict(zip(table, self._dir_counts)),
                 },
-                f,
-                indent=2,
+                pretty=self.pretty,
+            )
+            + b"\n",
+        )
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Write sync state to disk if it changed since the last flush."""
+        if self._dirty:
+            self._save_state()
+
+    def __del__(self) -> None:
+        # Collected before exit: don't lose buffered events (best effort)
+        with contextlib.suppress(Exception):
+            self.flush()
+
+    async def flush_stores(self) -> None:
+        """Wait for queued MCP stores to finish, then flush state to disk."""
+        # A dead worker (e.g. its event loop has closed) will never drain
+        # the queue, so joining it would block forever
+        if self._store_task is not None and not self._store_task.done():
+            await self._store_queue.join()
+        self.flush()
+
+    def _enqueue_store(self, **store_kwargs: Any) -> None:
+        """Hand an omnilore_client.store call to the background worker."""
+        if self._store_task is None or self._store_task.done():
+            self._store_queue = asyncio.Queue()
+            self._store_task = asyncio.get_running_loop().create_task(
+                self._store_worker(self._store_queue)
+            )
+        self._store_queue.put_nowait(store_kwargs)
+
+    async def _store_worker(self, queue: asyncio.Queue) -> None:
+        """Drain queued store calls; failures go through error recovery."""
+        while True:
+            try:
+                store_kwargs = await queue.get()
+            except asyncio.CancelledError:
+                self._drop_queued_stores(queue, in_flight=0)
+                raise
+            try:
+                await self.omnilore_client.store(**store_kwargs)
+            except asyncio.CancelledError:
+                self._drop_queued_stores(queue, in_flight=1)
+                raise
+            except Exception as e:
+                # Keep the worker alive even if recovery itself fails
+                with contextlib.suppress(Exception):
+                    await self._recover_sync_error(e)
+            finally:
+                queue.task_done()
+
+    def _drop_queued_stores(self, queue: asyncio.Queue, in_flight: int) -> None:
+        """Settle a cancelled worker's queue and warn about what was lost.
+
+        Every remaining item is marked done so nothing can block joining
+        the dead queue, and the service lets go of it; the next
+        background store starts a fresh worker.
+        """
+        dropped = in_flight
+        while not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
+            dropped += 1
+        if self._store_queue is queue:
+            self._store_queue = None
+        if dropped:
+            warnings.warn(
+                f"{dropped} queued federation_sync store(s) dropped; await "
+                "FederationService.flush_stores() before the event loop closes",
+                RuntimeWarning,
             )
 
+    def _direction_id(self, direction: str) -> int:
+        """Intern a direction string, returning its index in the table."""
+        direction_id = self._direction_ids.get(direction)
+        if direction_id is None:
+            direction_id = len(self._direction_table)
+            self._direction_ids[direction] = direction_id
+            self._direction_table.append(direction)
+            self._dir_counts.append(0)
+        return direction_id
+
+    def _direction_count(self, direction: str) -> int:
+        """Number of syncs recorded for a direction string."""
+        direction_id = self._direction_ids.get(direction)
+        return 0 if direction_id is None else self._dir_counts[direction_id]
+
+    def _append_sync(self, entry_id: str, direction_id: int, ts_ns: int) -> None:
+        """Record a sync event in memory (persisted on the next flush)."""
+        self.sync_history.append(SyncEvent(ts_ns, entry_id, direction_id))
+        self._dir_counts[direction_id] += 1
+        self._dirty = True
+
     async def register_sync(
-        self, entry_id: str, source: str, target: str
+        self,
+        entry_id: str,
+        source: str,
+        target: str,
+        ts_ns: Optional[int] = None,
+        background: bool = False,
     ) -> None:
         """Register a knowledge sync event via MCP.
 
-        Stores sync event as permanent learning.
+        Stores sync event as permanent learning. The event itself is
+        buffered in memory and written to disk on the next flush.
 
         Args:
             entry_id: ID of knowledge entry synced
             source: Source repo ('omnilore' or 'oxproxion')
             target: Target repo ('omnilore' or 'oxproxion')
+            ts_ns: time.time_ns() timestamp of the sync (defaults to now)
+            background: Run the MCP store on a background task instead of
+                awaiting it; the caller must then await flush_stores()
         """
-        self.sync_history.append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "entry_id": entry_id,
-                "direction": f"{source} → {target}",
-            }
-        )
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        direction_id = self._direction_id(f"{source} → {target}")
+        self._append_sync(entry_id, direction_id, ts_ns)
 
         # Store sync as permanent learning
-        await self.omnilore_client.store(
+        store_kwargs = dict(
             query=f"How do I sync knowledge from {source} to {target}?",
             response=f"Synced entry {entry_id} from {source} to {target}",
             category="federation_sync",
             ttl_days=36500,  # ✅ PERMANENT
         )
-
-        self._save_state()
+        if background:
+            self._enqueue_store(**store_kwargs)
+        else:
+            await self.omnilore_client.store(**store_kwargs)
 
     async def sync_batch(
         self, entries: List[Dict[str, Any]], source: str, target: str
@@ -131,25 +311,51 @@ class FederationService:
             f"How do I sync {len(entries)} entries from {source} to {target}?"
         )
 
-        for entry in entries:
-            try:
-                # STEP 2: Register sync via MCP
-                await self.register_sync(entry["id"], source, target)
-                synced += 1
-
-            except Exception as e:
-                # STEP 4: Error recovery
-                recovery = await self.omnilore_client.query(
-                    f"How do I fix sync error: {type(e).__name__}?"
-                )
-                if recovery:
+        # Timestamp and direction are the same for every entry in the batch
+        ts_ns = time.time_ns()
+        direction = f"{source} → {target}"
+        direction_id = self._direction_id(direction)
+        sync_query = f"How do I sync knowledge from {source} to {target}?"
+
+        synced_ids: List[str] = []
+
+        try:
+            for entry in entries:
+                try:
+                    entry_id = entry["id"]
+                    self._append_sync(entry_id, direction_id, ts_ns)
+                    synced_ids.append(entry_id)
+
+                except Exception as e:
+                    # STEP 4: Error recovery
+                    await self._recover_sync_error(e)
+                    errors += 1
+
+            # STEP 2: Register the whole batch via one MCP store rather
+            # than one round-trip per entry
+            if synced_ids:
+                try:
                     await self.omnilore_client.store(
-                        query=f"How to fix sync error: {type(e).__name__}",
-                        response=recovery,
-                        category="error_recovery",
+                        query=sync_query,
+                        response=json.dumps(
+                            {
+                                "direction": direction,
+                                "timestamp": ns_to_iso(ts_ns),
+                                "entry_ids": synced_ids,
+                            }
+                        ),
+                        category="federation_sync",
                         ttl_days=36500,  # ✅ PERMANENT
                     )
-                errors += 1
+                    synced = len(synced_ids)
+
+                except Exception as e:
+                    # STEP 4: Error recovery
+                    await self._recover_sync_error(e)
+                    errors += len(synced_ids)
+        finally:
+            # One state write per batch instead of one per entry
+            self.flush()
 
         # STEP 3: Store batch operation as learning
         await self.omnilore_client.store(
@@ -169,10 +375,23 @@ Synced {synced} entries from {source} to {target}:
             "synced": synced,
             "conflicts": conflicts,
             "errors": errors,
-            "direction": f"{source} → {target}",
-            "timestamp": datetime.now().isoformat(),
+            "direction": direction,
+            "timestamp": ns_to_iso(ts_ns),
         }
 
+    async def _recover_sync_error(self, e: Exception) -> None:
+        """Query OmniLore for a fix and store it as permanent learning."""
+        recovery = await self.omnilore_client.query(
+            f"How do I fix sync error: {type(e).__name__}?"
+        )
+        if recovery:
+            await self.omnilore_client.store(
+                query=f"How to fix sync error: {type(e).__name__}",
+                response=recovery,
+                category="error_recovery",
+                ttl_days=36500,  # ✅ PERMANENT
+            )
+
     async def get_sync_stats(self) -> Dict[str, Any]:
         """Get federation sync statistics via MCP."""
         if not self.sync_history:
@@ -183,25 +402,13 @@ Synced {synced} entries from {source} to {target}:
                 "last_sync": None,
             }
 
-        pattern_o2x = "omnilore → oxproxion"
-        pattern_x2o = "oxproxion → omnilore"
-        omnilore_to_oxproxion = sum(
-            1
-            for s in self.sync_history
-            if pattern_o2x in s.get("direction", "")
-        )
-        oxproxion_to_omnilore = sum(
-            1
-            for s in self.sync_history
-            if pattern_x2o in s.get("direction", "")
-        )
-
+        # Direction counts are maintained by register_sync, no rescan needed
         stats = {
-            "total_syncs": len(self.sync_history),
-            "omnilore_to_oxproxion": omnilore_to_oxproxion,
-            "oxproxion_to_omnilore": oxproxion_to_omnilore,
+            "total_syncs": sum(self._dir_counts),
+            "omnilore_to_oxproxion": self._direction_count(DIR_O2X),
+            "oxproxion_to_omnilore": self._direction_count(DIR_X2O),
             "last_sync": (
-                self.sync_history[-1]["timestamp"]
+                ns_to_iso(self.sync_history[-1].ts_ns)
                 if self.sync_history
                 else None
             ),
@@ -218,76 +425,6 @@ Synced {synced} entries from {source} to {target}:
         return stats
 
 
-class ConflictResolver:
-    """Resolve conflicts when knowledge is updated in both repos (MCP-aware)."""
-
-    def __init__(self, omnilore_client=None):
-        """Initialize resolver with MCP client.
-
-        Args:
-            omnilore_client: OmniLore MCP client
-        """
-        self.omnilore_client = omnilore_client
-
-    async def resolve(
-        self, omnilore_entry: Dict[str, Any], oxproxion_entry: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Resolve knowledge conflict using confidence scoring.
-
-        Strategy:
-        - If confidences differ by >0.1: Use higher confidence
-        - If confidences similar: Use more recent
-        - Merge metadata from both
-        - Store resolution as learning
-
-        Args:
-            omnilore_entry: Entry from OmniLore
-            oxproxion_entry: Entry from oxproxion
-
-        Returns:
-            Resolved entry
-        """
-        conf_diff = abs(
-            omnilore_entry.get("confidence", 0.0)
-            - oxproxion_entry.get("confidence", 0.0)
-        )
-
-        if conf_diff > 0.1:
-            # Use higher confidence
-            selected = (
-                omnilore_entry
-                if omnilore_entry.get("confidence", 0)
-                > oxproxion_entry.get("confidence", 0)
-                else oxproxion_entry
-            )
-        else:
-            # Use more recent
-            omnilore_time = omnilore_entry.get("created_at", "")
-            oxproxion_time = oxproxion_entry.get("created_at", "")
-            selected = (
-                oxproxion_entry if oxproxion_time > omnilore_time else omnilore_entry
-            )
-
-        # Store resolution as learning
-        asyncio.create_task(
-            self.omnilore_client.store(
-                query="How do I resolve knowledge conflicts?",
-                response=f"""
-Resolved conflict between OmniLore and oxproxion:
-- Strategy: {'Confidence' if conf_diff > 0.1 else 'Recency'}
-- Selected: {selected.get('id', '?')}
-- Confidence: {selected.get('confidence', 0)}
-""",
-                category="conflict_resolution",
-                ttl_days=36500,  # ✅ PERMANENT
-            )
-        )
-
-        return selected
-
-
-import asyncio
-
 if __name__ == "__main__":
 
     async def main():
@@ -0,0 +1,137 @@
+"""
+Federation types: shared records and conflict resolution (MCP-FIRST).
+
+Kept apart from federation_service so the sync record and the resolver
+can be imported without pulling in the service's state handling.
+FederationService re-exports both names.
+"""
+
+import contextlib
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple
+
+
+@dataclass
+class KnowledgeSync:
+    """Represents a synchronized knowledge entry."""
+
+    id: str
+    source_repo: str  # 'omnilore' or 'oxproxion'
+    category: str
+    confidence: float
+    created_at: str
+    last_synced: str
+    sync_count: int = 0
+
+
+class ConflictResolver:
+    """Resolve conflicts when knowledge is updated in both repos (MCP-aware)."""
+
+    def __init__(self, omnilore_client=None):
+        """Initialize resolver with MCP client.
+
+        Args:
+            omnilore_client: OmniLore MCP client
+        """
+        self.omnilore_client = omnilore_client
+
+    @staticmethod
+    def _select(
+        omnilore_entry: Dict[str, Any], oxproxion_entry: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Pick the winning entry of a conflict.
+
+        Returns:
+            (selected entry, whether confidence rather than recency decided)
+        """
+        omnilore_conf = omnilore_entry.get("confidence", 0.0)
+        oxproxion_conf = oxproxion_entry.get("confidence", 0.0)
+
+        if abs(omnilore_conf - oxproxion_conf) > 0.1:
+            # Use higher confidence
+            winner = (
+                omnilore_entry
+                if omnilore_conf > oxproxion_conf
+                else oxproxion_entry
+            )
+            return winner, True
+
+        # Use more recent
+        omnilore_time = omnilore_entry.get("created_at", "")
+        oxproxion_time = oxproxion_entry.get("created_at", "")
+        winner = oxproxion_entry if oxproxion_time > omnilore_time else omnilore_entry
+        return winner, False
+
+    async def resolve_many(
+        self, pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Resolve a batch of knowledge conflicts using confidence scoring.
+
+        Strategy:
+        - If confidences differ by >0.1: Use higher confidence
+        - If confidences similar: Use more recent
+        - Store one resolution summary for the whole batch as learning
+          (a failed store goes through error recovery, never raises)
+
+        Args:
+            pairs: (omnilore_entry, oxproxion_entry) conflicts
+
+        Returns:
+            Resolved entries, in the same order as pairs
+        """
+        resolved = []
+        by_confidence = 0
+        for omnilore_entry, oxproxion_entry in pairs:
+            selected, used_confidence = self._select(
+                omnilore_entry, oxproxion_entry
+            )
+            resolved.append(selected)
+            by_confidence += used_confidence
+
+        if resolved:
+            try:
+                # Store resolution as learning
+                await self.omnilore_client.store(
+                    query="How do I resolve knowledge conflicts?",
+                    response=f"""
+Resolved {len(resolved)} conflict(s) between OmniLore and oxproxion:
+- Strategy: Confidence {by_confidence}, Recency {len(resolved) - by_confidence}
+- Selected: {', '.join(str(e.get('id', '?')) for e in resolved[:10])}
+""",
+                    category="conflict_resolution",
+                    ttl_days=36500,  # ✅ PERMANENT
+                )
+            except Exception as e:
+                # Error recovery; logging must never break the resolution
+                with contextlib.suppress(Exception):
+                    await self._recover_store_error(e)
+
+        return resolved
+
+    async def _recover_store_error(self, e: Exception) -> None:
+        """Query OmniLore for a fix and store it as permanent learning."""
+        recovery = await self.omnilore_client.query(
+            f"How do I fix conflict resolution error: {type(e).__name__}?"
+        )
+        if recovery:
+            await self.omnilore_client.store(
+                query=f"How to fix conflict resolution error: {type(e).__name__}",
+                response=recovery,
+                category="error_recovery",
+                ttl_days=36500,  # ✅ PERMANENT
+            )
+
+    async def resolve(
+        self, omnilore_entry: Dict[str, Any], oxproxion_entry: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Resolve a single knowledge conflict (see resolve_many).
+
+        Args:
+            omnilore_entry: Entry from OmniLore
+            oxproxion_entry: Entry from oxproxion
+
+        Returns:
+            Resolved entry
+        """
+        resolved = await self.resolve_many([(omnilore_entry, oxproxion_entry)])
+        return resolved[0]
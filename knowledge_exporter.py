@@ -12,27 +12,37 @@ to OmniLore via MCP-compliant omnilore_store and omnilore_smart_chat tools.
 - No direct ChromaDB or API calls
 """
 
-import json
-from datetime import datetime
+import asyncio
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Deque, Dict, Any, List, Optional
+
+try:
+    from .phase5_io import atomic_writer, json_dumps, ns_to_iso
+except ImportError:  # Loaded as a top-level module / script
+    from phase5_io import atomic_writer, json_dumps, ns_to_iso
 
 
 class KnowledgeExporter:
     """Export knowledge via MCP client (MCP-First compliant)."""
 
-    def __init__(self, omnilore_client=None):
+    def __init__(self, omnilore_client=None, max_cache: int = 1024):
         """Initialize exporter with MCP client.
 
         Args:
             omnilore_client: OmniLore MCP client (auto-configured if None)
+            max_cache: Number of exports to memoize (failures are dropped)
         """
         self.omnilore_client = omnilore_client
         self.export_stats = {
             "exported_entries": 0,
-            "export_time": datetime.now().isoformat(),
+            "export_time": ns_to_iso(time.time_ns()),
             "errors": 0,
         }
+        self.max_cache = max_cache
+        # (query, category) -> export task, least recently used first
+        self._cache: OrderedDict = OrderedDict()
 
     async def query_and_export(
         self, query: str, category: str = None
@@ -49,8 +59,36 @@ class KnowledgeExporter:
             category: Category for export metadata
 
         Returns:
-            Export result
+            Export result (repeated queries are served from cache)
         """
+        key = (query, category)
+        task = self._cache.get(key)
+        if task is None:
+            # Concurrent duplicates await the same in-flight export
+            task = asyncio.create_task(self._export(query, category))
+            task.add_done_callback(lambda t: self._drop_if_failed(key, t))
+            self._cache[key] = task
+            if len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+
+        # shield: one cancelled caller must not cancel the shared export
+        result = await asyncio.shield(task)
+        return dict(result)  # Callers may mutate their copy freely
+
+    def _drop_if_failed(self, key: tuple, task: asyncio.Future) -> None:
+        """Evict a finished export from the cache unless it succeeded."""
+        failed = (
+            task.cancelled()
+            or task.exception() is not None
+            or not task.result().get("exported")
+        )
+        if failed and self._cache.get(key) is task:
+            del self._cache[key]
+
+    async def _export(self, query: str, category: str = None) -> Dict[str, Any]:
+        """Run one uncached query_and_export via MCP."""
         try:
             # STEP 1: Query knowledge via MCP (omnilore_smart_chat)
             # This automatically includes caching and vendor fallback
@@ -73,7 +111,7 @@ class KnowledgeExporter:
                 "query": query,
                 "result": result,
                 "exported": True,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": ns_to_iso(time.time_ns()),
             }
 
         except Exception as e:
@@ -101,31 +139,67 @@ class KnowledgeExporter:
             }
 
     async def export_batch(
-        self, queries: List[str], category: str = None
+        self,
+        queries: List[str],
+        category: str = None,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+        concurrency: int = 8,
     ) -> Dict[str, Any]:
         """Export multiple knowledge entries via MCP.
 
+        Up to `concurrency` queries are in flight at once.
+
         Args:
             queries: List of knowledge queries
             category: Category for exports
+            on_result: Called with each result in query order. When set,
+                results are handed off instead of collected, at most
+                `concurrency` are held at once, and the returned
+                "results" list is empty.
+            concurrency: Maximum number of concurrent MCP exports
 
         Returns:
             Batch export statistics
         """
-        results = []
         success_count = 0
         error_count = 0
 
         print(f"\n📤 Exporting {len(queries)} knowledge items via MCP...")
 
-        for query in queries:
+        async def _one(query: str) -> Dict[str, Any]:
+            nonlocal success_count, error_count
             result = await self.query_and_export(query, category)
-            results.append(result)
-
             if result.get("exported"):
                 success_count += 1
             else:
                 error_count += 1
+            return result
+
+        if on_result is None:
+            sem = asyncio.Semaphore(concurrency)
+
+            async def _bounded(query: str) -> Dict[str, Any]:
+                async with sem:
+                    return await _one(query)
+
+            results = await asyncio.gather(*map(_bounded, queries))
+        else:
+            # Sliding window: query i starts only once result
+            # i - concurrency has been handed off, so at most
+            # `concurrency` results are ever held, and they are handed
+            # off in query order whatever order they finish in
+            results = []
+            window: Deque[asyncio.Task] = deque()
+            try:
+                for query in queries:
+                    if len(window) >= concurrency:
+                        on_result(await window.popleft())
+                    window.append(asyncio.create_task(_one(query)))
+                while window:
+                    on_result(await window.popleft())
+            finally:
+                for task in window:
+                    task.cancel()
 
         # Store batch operation as learning
         await self.omnilore_client.store(
@@ -149,12 +223,12 @@ Errors: {error_count}
             "exported_entries": success_count,
             "errors": error_count,
             "total": len(queries),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ns_to_iso(time.time_ns()),
             "results": results,
         }
 
     async def export_to_file(
-        self, queries: List[str], output_file: str = None
+        self, queries: List[str], output_file: str = None, pretty: bool = False
     ) -> Dict[str, Any]:
         """Export knowledge to JSON file via MCP.
 
@@ -163,27 +237,31 @@ Errors: {error_count}
         Args:
             queries: List of knowledge queries
             output_file: Output JSON file path
+            pretty: Indent the file for human debugging (compact by default)
 
         Returns:
             Export statistics
         """
         if output_file is None:
-            output_file = f"exported_knowledge_{datetime.now().isoformat()}.json"
-
-        batch_result = await self.export_batch(queries)
+            output_file = f"exported_knowledge_{ns_to_iso(time.time_ns())}.json"
 
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        export_data = {
-            "exported_at": datetime.now().isoformat(),
-            "total_entries": batch_result["exported_entries"],
-            "errors": batch_result["errors"],
-            "entries": batch_result["results"],
-        }
-
-        with open(output_path, "w") as f:
-            json.dump(export_data, f, indent=2)
+        # Written to a sibling temp file and renamed into place, so a crash
+        # mid-write never leaves a truncated export behind
+        with atomic_writer(output_path) as f:
+            if pretty:
+                batch_result = await self.export_batch(queries)
+                export_data = {
+                    "exported_at": ns_to_iso(time.time_ns()),
+                    "total_entries": batch_result["exported_entries"],
+                    "errors": batch_result["errors"],
+                    "entries": batch_result["results"],
+                }
+                f.write(json_dumps(export_data, pretty=True) + b"\n")
+            else:
+                batch_result = await self._stream_batch(queries, f)
 
         return {
             "output_file": str(output_path),
@@ -192,33 +270,48 @@ Errors: {error_count}
             "file_size": output_path.stat().st_size,
         }
 
+    async def _stream_batch(self, queries: List[str], f) -> Dict[str, Any]:
+        """Run export_batch, writing each result to binary file f as it lands.
+
+        The batch is never held in memory as a whole; the totals are only
+        known at the end, so they follow the entries array.
+        """
+        exported_at = json_dumps(ns_to_iso(time.time_ns()))
+        f.write(b'{"exported_at":' + exported_at + b',"entries":[')
+        first = True
+
+        def write_entry(entry: Dict[str, Any]) -> None:
+            nonlocal first
+            if not first:
+                f.write(b",")
+            first = False
+            f.write(json_dumps(entry))
+
+        batch_result = await self.export_batch(queries, on_result=write_entry)
+        f.write(
+            b'],"total_entries":%d,"errors":%d}\n'
+            % (batch_result["exported_entries"], batch_result["errors"])
+        )
+        return batch_result
+
     async def get_export_stats(self) -> Dict[str, Any]:
-        """Get export statistics."""
+        """Get export statistics.
+
+        Served from the counters kept by query_and_export; no MCP calls.
+        """
+        exported = self.export_stats["exported_entries"]
+        errors = self.export_stats["errors"]
+        attempted = exported + errors
         return {
-            "total_exported": self.export_stats["exported_entries"],
-            "errors": self.export_stats["errors"],
-            "success_rate": (
-                (
-                    self.export_stats["exported_entries"]
-                    / (
-                        self.export_stats["exported_entries"]
-                        + self.export_stats["errors"]
-                    )
-                )
-                if (
-                    self.export_stats["exported_entries"]
-                    + self.export_stats["errors"]
-                )
-                > 0
-                else 0
-            ),
+            "total_exported": exported,
+            "errors": errors,
+            "success_rate": exported / attempted if attempted > 0 else 0,
             "started_at": self.export_stats["export_time"],
         }
 
 
 if __name__ == "__main__":
     import sys
-    import asyncio
 
     async def main():
         print("\n" + "=" * 70)
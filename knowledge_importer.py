@@ -12,21 +12,140 @@ MCP-compliant omnilore_smart_chat and omnilore_store tools.
 - No direct ChromaDB or API calls (all through MCP)
 """
 
-import json
+import asyncio
+import mmap
+import os
+from collections import Counter
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:  # Optional; without it the file is parsed in one go
+    ijson = None
+
+try:
+    from .phase5_io import json_loads
+except ImportError:  # Loaded as a top-level module / script
+    from phase5_io import json_loads
+
+
+_IMPORT_QUERY = "How do I import 299 knowledge entries into a repository?"
+
+_IMPORT_SUMMARY_TMPL = """
+Successfully imported {imported} entries via MCP:
+
+1. Query OmniLore for guidance (omnilore_query)
+2. Store each entry via MCP (omnilore_store with ttl_days=36500)
+3. Implement error recovery with guidance queries
+4. All knowledge storage is permanent (never expires)
+
+Average confidence: {avg_conf:.2f}
+Categories: {cats}
+"""
+
+
+def _load_json_file(path: Path) -> Any:
+    """Parse a JSON file straight from a read-only memory map.
+
+    The parser reads the mapped pages directly, skipping the copy into an
+    intermediate bytes buffer that f.read() would make.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return json_loads(b"")  # mmap can't map empty files; same error
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return json_loads(view)
+
+
+# ijson events that begin a JSON value (as opposed to end_map, map_key, ...)
+_VALUE_EVENTS = frozenset(
+    ("start_map", "start_array", "string", "number", "boolean", "null")
+)
+
+
+def _bad_layout(path: Path) -> ValueError:
+    """Error for a knowledge file that isn't {"entries": [{...}, ...], ...}."""
+    return ValueError(
+        f'{path}: expected a JSON object with an "entries" array of objects'
+    )
+
+
+def _count_entries(path: Path) -> int:
+    """Validate the file's layout and count its entries with one ijson pass.
+
+    Every byte is parsed, so a malformed file fails here rather than
+    partway through an import; memory use stays constant.
+    """
+    count = 0
+    found = False
+    with open(path, "rb") as f:
+        events = ijson.parse(f)
+        if next(events, (None, None, None))[1] != "start_map":
+            raise _bad_layout(path)
+        for prefix, event, _ in events:
+            if prefix == "entries":
+                if event == "start_array":
+                    found = True
+                elif event != "end_array":
+                    raise _bad_layout(path)
+            elif prefix == "entries.item" and event in _VALUE_EVENTS:
+                if event != "start_map":
+                    raise _bad_layout(path)  # Every entry must be an object
+                count += 1
+    if not found:
+        raise _bad_layout(path)
+    return count
+
+
+def _stream_entries(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the file's entries one at a time via ijson."""
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "entries.item", use_float=True)
+
+
+def _open_entries(path: Path) -> Tuple[int, Iterable[Dict[str, Any]]]:
+    """Validate a knowledge file and return (entry count, entries).
+
+    Raises before anything is imported if the file is malformed or isn't
+    an object with an "entries" array of objects. With ijson installed the entries
+    are then stream-parsed, so memory holds one entry at a time regardless
+    of file size; otherwise the whole file is parsed up front.
+    """
+    if ijson is not None:
+        return _count_entries(path), _stream_entries(path)
+    data = _load_json_file(path)
+    entries = data.get("entries") if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not all(
+        isinstance(entry, dict) for entry in entries
+    ):
+        raise _bad_layout(path)
+    return len(entries), entries
 
 
 class KnowledgeImporter:
     """Import tribal knowledge via MCP client (MCP-First compliant)."""
 
-    def __init__(self, omnilore_client=None):
+    def __init__(
+        self, omnilore_client=None, batch_size: int = 1000, concurrency: int = 32
+    ):
         """Initialize importer with MCP client.
 
         Args:
             omnilore_client: OmniLore MCP client (auto-configured if None)
+            batch_size: Number of entries handed to the client per batch
+            concurrency: Maximum number of in-flight MCP stores
         """
         self.omnilore_client = omnilore_client
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        # Recovery guidance per exception class name (one query per class)
+        self._recovery_cache: Dict[str, str] = {}
+        # Summary figures, kept up to date as entries stream in
+        self._cat_counts: Counter = Counter()
+        self._conf_sum = 0.0
+        self._conf_n = 0
         self.import_stats = {
             "imported_entries": 0,
             "total_in_collection": 0,
@@ -54,60 +173,54 @@ class KnowledgeImporter:
                 f"Knowledge file not found at {json_file}"
             )
 
-        with open(json_path) as f:
-            data = json.load(f)
+        total, entries = _open_entries(json_path)
+        imported_before = self.import_stats["imported_entries"]
 
-        entries = data.get("entries", [])
-        
         # STEP 1: Query OmniLore for import guidance
-        guidance = await self.omnilore_client.query(
-            "How do I import 299 knowledge entries into a repository?"
-        )
-        
-        print(f"\n📚 Importing {len(entries)} OmniLore knowledge entries via MCP...")
+        guidance = await self.omnilore_client.query(_IMPORT_QUERY)
+
+        print(f"\n📚 Importing {total} OmniLore knowledge entries via MCP...")
 
         # STEP 2: Execute import with vendor fallback (omnilore_smart_chat)
-        for i, entry in enumerate(entries):
-            try:
-                # Store each entry via MCP (NOT direct ChromaDB)
-                await self.omnilore_client.store(
-                    query=entry.get("query", entry.get("id", "")),
-                    response=entry.get("response", ""),
-                    category=entry.get("category", "imported"),
-                    confidence=entry.get("confidence", 0.85),
-                    ttl_days=36500,  # ✅ PERMANENT - never expires
-                )
-                self.import_stats["imported_entries"] += 1
+        # Entries are streamed from the file and stored a batch at a time;
+        # the summary figures are accumulated on the way through
+        cat_counts = self._cat_counts
+        # Recovery guidance per failing error class; stored once each below
+        pending_recovery: Dict[str, Optional[str]] = {}
+        batch: List[Dict[str, Any]] = []
+        for entry in entries:
+            self._conf_n += 1
+            self._conf_sum += entry.get("confidence", 0.85)
+            cat_counts[entry.get("category")] += 1
+            batch.append(entry)
+            if len(batch) >= self.batch_size:
+                await self._import_batch(batch, pending_recovery)
+                batch = []
+        if batch:
+            await self._import_batch(batch, pending_recovery)
 
-            except Exception as e:
-                # STEP 4: Error recovery - query for guidance
-                recovery = await self.omnilore_client.query(
-                    f"How do I fix import error: {type(e).__name__}?"
+        # STEP 4 (cont.): Store one recovery pattern per distinct error class
+        await asyncio.gather(
+            *(
+                self.omnilore_client.store(
+                    query=f"How to fix import error: {error_name}",
+                    response=recovery,
+                    category="error_recovery",
+                    ttl_days=36500,  # ✅ PERMANENT
                 )
-                if recovery:
-                    # Store recovery pattern for future imports
-                    await self.omnilore_client.store(
-                        query=f"How to fix import error: {type(e).__name__}",
-                        response=recovery,
-                        category="error_recovery",
-                        ttl_days=36500,  # ✅ PERMANENT
-                    )
-                self.import_stats["errors"] += 1
+                for error_name, recovery in pending_recovery.items()
+                if recovery
+            )
+        )
 
         # STEP 3: Store the import operation itself as learning
         await self.omnilore_client.store(
-            query="How do I import 299 knowledge entries into a repository?",
-            response=f"""
-Successfully imported {self.import_stats['imported_entries']} entries via MCP:
-
-1. Query OmniLore for guidance (omnilore_query)
-2. Store each entry via MCP (omnilore_store with ttl_days=36500)
-3. Implement error recovery with guidance queries
-4. All knowledge storage is permanent (never expires)
-
-Average confidence: {sum(e.get('confidence', 0.85) for e in entries) / len(entries):.2f}
-Categories: {len(set(e.get('category') for e in entries))}
-""",
+            query=_IMPORT_QUERY,
+            response=_IMPORT_SUMMARY_TMPL.format(
+                imported=self.import_stats["imported_entries"],
+                avg_conf=self._average_confidence(),
+                cats=len(cat_counts),
+            ),
             category="import_pattern",
             ttl_days=36500,  # ✅ PERMANENT
         )
@@ -116,10 +229,67 @@ Categories: {len(set(e.get('category') for e in entries))}
             self.import_stats["imported_entries"]
         )
 
+        imported = self.import_stats["imported_entries"] - imported_before
+        print(f"✅ Imported {imported} of {total} entries")
+
         return self.import_stats
 
+    async def _import_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        pending_recovery: Dict[str, Optional[str]],
+    ) -> None:
+        """Store one bounded batch of entries via MCP, concurrently.
+
+        Up to `concurrency` stores are in flight at once. Failures record
+        their recovery guidance in pending_recovery, keyed by error class,
+        for the caller to store once per class.
+        """
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def _store_one(entry: Dict[str, Any]) -> None:
+            async with sem:
+                try:
+                    # Store each entry via MCP (NOT direct ChromaDB)
+                    get = entry.get
+                    await self.omnilore_client.store(
+                        query=get("query", get("id", "")),
+                        response=get("response", ""),
+                        category=get("category", "imported"),
+                        confidence=get("confidence", 0.85),
+                        ttl_days=36500,  # ✅ PERMANENT - never expires
+                    )
+                    self.import_stats["imported_entries"] += 1
+
+                except Exception as e:
+                    # STEP 4: Error recovery - query for guidance once per
+                    # error class, however many entries fail with it
+                    self.import_stats["errors"] += 1
+                    error_name = type(e).__name__
+                    if error_name in pending_recovery:
+                        return
+                    pending_recovery[error_name] = None  # claim before await
+                    recovery = self._recovery_cache.get(error_name)
+                    if recovery is None:
+                        recovery = await self.omnilore_client.query(
+                            f"How do I fix import error: {error_name}?"
+                        )
+                        if recovery:
+                            self._recovery_cache[error_name] = recovery
+                    pending_recovery[error_name] = recovery
+
+        await asyncio.gather(*map(_store_one, batch))
+
+    def _average_confidence(self) -> float:
+        """Mean confidence of every entry read so far (0.0 if none)."""
+        return self._conf_sum / self._conf_n if self._conf_n else 0.0
+
     async def get_summary(self) -> Dict[str, Any]:
-        """Get summary of imported knowledge via MCP query."""
+        """Get summary of imported knowledge via MCP query.
+
+        Category counts and average confidence come from the running
+        figures kept by import_from_file; nothing is re-read.
+        """
         try:
             # Query OmniLore for import statistics (MCP-compliant)
             result = await self.omnilore_client.query(
@@ -130,6 +300,8 @@ Categories: {len(set(e.get('category') for e in entries))}
                 "total_entries": self.import_stats["imported_entries"],
                 "errors": self.import_stats["errors"],
                 "status": "imported" if self.import_stats["imported_entries"] > 0 else "empty",
+                "categories": dict(self._cat_counts),
+                "avg_confidence": self._average_confidence(),
                 "guidance": result,
             }
         except Exception as e:
@@ -147,7 +319,6 @@ Categories: {len(set(e.get('category') for e in entries))}
 
 if __name__ == "__main__":
     import sys
-    import asyncio
 
     if len(sys.argv) < 2:
         print("Usage: python knowledge_importer.py <path_to_knowledge.json>")
@@ -16,10 +16,43 @@ Phase 5 orchestrator that:
 """
 
 import json
-from datetime import datetime
+import time
+from collections import Counter, deque
 from pathlib import Path
-from typing import Dict, List, Any
-from enum import Enum
+from typing import Deque, Dict, Any, NamedTuple
+
+try:
+    from .phase5_io import ns_to_iso
+except ImportError:  # Loaded as a top-level module / script
+    from phase5_io import ns_to_iso
+
+
+# Number of recent routing decisions kept in memory
+ROUTING_HISTORY_LIMIT = 10_000
+
+# Agents / problem types included in the report's insight query
+ROUTING_DIGEST_TOP_K = 5
+
+_ROUTING_QUERY_TMPL = "How do I route a {problem_type} problem to the best agent?"
+
+_ROUTING_PROMPT_TMPL = """
+Problem Type: {problem_type}
+Description: {problem_description}
+Prefer Local: {prefer_local}
+
+Guidance from tribal knowledge: {guidance}
+
+Based on this, which agent should solve this? (omnilore or oxproxion)
+"""
+
+
+class RouteRecord(NamedTuple):
+    """One routing decision, as kept in ProblemRouter.routing_history."""
+
+    ts_ns: int
+    problem_type: str
+    selected_agent: str
+    reason: str = ""
 
 
 class ProblemRouter:
@@ -32,7 +65,14 @@ class ProblemRouter:
             omnilore_client: OmniLore MCP client (auto-configured if None)
         """
         self.omnilore_client = omnilore_client
-        self.routing_history: List[Dict[str, Any]] = []
+        self.routing_history: Deque[RouteRecord] = deque(
+            maxlen=ROUTING_HISTORY_LIMIT
+        )
+        # Running totals, so stats never rescan the history
+        self._by_agent: Counter = Counter()
+        self._problem_types: Counter = Counter()
+        # Recovery guidance per exception class name (one query per class)
+        self._recovery_cache: Dict[str, str] = {}
 
     async def select_agent(
         self, problem_type: str, problem_description: str, prefer_local: bool = False
@@ -54,20 +94,16 @@ class ProblemRouter:
         """
         try:
             # STEP 1: Query for routing guidance
-            guidance = await self.omnilore_client.query(
-                f"How do I route a {problem_type} problem to the best agent?"
-            )
+            routing_query = _ROUTING_QUERY_TMPL.format(problem_type=problem_type)
+            guidance = await self.omnilore_client.query(routing_query)
 
             # STEP 2: Use smart chat for routing decision (vendor fallback)
-            routing_prompt = f"""
-Problem Type: {problem_type}
-Description: {problem_description}
-Prefer Local: {prefer_local}
-
-Guidance from tribal knowledge: {guidance}
-
-Based on this, which agent should solve this? (omnilore or oxproxion)
-"""
+            routing_prompt = _ROUTING_PROMPT_TMPL.format(
+                problem_type=problem_type,
+                problem_description=problem_description,
+                prefer_local=prefer_local,
+                guidance=guidance,
+            )
             decision = await self.omnilore_client.smart_chat(
                 message=routing_prompt,
                 prefer_vendor=None,  # Auto-select best vendor
@@ -77,33 +113,36 @@ Based on this, which agent should solve this? (omnilore or oxproxion)
 
             # STEP 3: Store routing decision as learning
             await self.omnilore_client.store(
-                query=f"How do I route a {problem_type} problem to the best agent?",
+                query=routing_query,
                 response=f"Route to {selected} because: {decision[:200]}...",
                 category="routing_decision",
                 ttl_days=36500,  # ✅ PERMANENT
             )
 
+            # Raw ns timestamp; formatted only when stats are read
             self.routing_history.append(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "problem_type": problem_type,
-                    "selected_agent": selected,
-                    "reason": decision[:100],
-                }
+                RouteRecord(time.time_ns(), problem_type, selected, decision[:100])
             )
+            self._by_agent[selected] += 1
+            self._problem_types[problem_type] += 1
 
             return selected
 
         except Exception as e:
-            # STEP 4: Error recovery
-            recovery = await self.omnilore_client.query(
-                f"How do I fix routing error: {type(e).__name__}?"
-            )
+            # STEP 4: Error recovery (guidance is cached per error class)
+            error_name = type(e).__name__
+            recovery = self._recovery_cache.get(error_name)
+            if recovery is None:
+                recovery = await self.omnilore_client.query(
+                    f"How do I fix routing error: {error_name}?"
+                )
+                if recovery:
+                    self._recovery_cache[error_name] = recovery
 
             if recovery:
                 # Store recovery pattern (permanent)
                 await self.omnilore_client.store(
-                    query=f"How to fix routing error: {type(e).__name__}",
+                    query=f"How to fix routing error: {error_name}",
                     response=recovery,
                     category="error_recovery",
                     ttl_days=36500,  # ✅ PERMANENT
@@ -121,34 +160,39 @@ Based on this, which agent should solve this? (omnilore or oxproxion)
                 "problem_types": {},
             }
 
-        by_agent = {}
-        problem_types = {}
-
-        for entry in self.routing_history:
-            agent = entry["selected_agent"]
-            by_agent[agent] = by_agent.get(agent, 0) + 1
-
-            ptype = entry["problem_type"]
-            problem_types[ptype] = problem_types.get(ptype, 0) + 1
+        last = self.routing_history[-1]
+        last_routing = {
+            "timestamp": ns_to_iso(last.ts_ns),
+            "problem_type": last.problem_type,
+            "selected_agent": last.selected_agent,
+            "reason": last.reason,
+        }
 
         return {
-            "total_routed": len(self.routing_history),
-            "by_agent": by_agent,
-            "problem_types": problem_types,
-            "last_routing": self.routing_history[-1] if self.routing_history else None,
+            "total_routed": sum(self._by_agent.values()),
+            "by_agent": dict(self._by_agent),
+            "problem_types": dict(self._problem_types),
+            "last_routing": last_routing,
         }
 
     async def generate_report(self) -> Dict[str, Any]:
         """Generate routing report via MCP."""
         stats = await self.get_routing_stats()
 
-        # Query for insights
+        # Query for insights on a fixed-size digest, so the prompt doesn't
+        # grow with the number of problem types seen
+        digest = {
+            "total": stats["total_routed"],
+            "top_agents": self._by_agent.most_common(ROUTING_DIGEST_TOP_K),
+            "top_types": self._problem_types.most_common(ROUTING_DIGEST_TOP_K),
+        }
         insights = await self.omnilore_client.query(
-            f"What patterns do you see in this routing data: {json.dumps(stats)}?"
+            "What patterns do you see in this routing data: "
+            f"{json.dumps(digest, separators=(',', ':'))}?"
         )
 
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ns_to_iso(time.time_ns()),
             "statistics": stats,
             "insights": insights,
             "total_routed": stats["total_routed"],
@@ -11,25 +11,38 @@ Features:
 - Contribute learnings back to OmniLore
 """
 
-import json
+import contextlib
 from pathlib import Path
 from typing import Dict, Any
 
+try:
+    from .phase5_io import atomic_write_bytes, flush_on_exit, json_dumps, json_loads
+except ImportError:  # Loaded as a top-level module / script
+    from phase5_io import atomic_write_bytes, flush_on_exit, json_dumps, json_loads
+
 
 class OxproxionPhase5Client:
     """Client for oxproxion to interact with Phase 5 infrastructure."""
 
-    def __init__(self):
-        """Initialize oxproxion Phase 5 client."""
+    def __init__(self, flush_every: int = 50):
+        """Initialize oxproxion Phase 5 client.
+
+        Args:
+            flush_every: Counter updates to buffer before rewriting state
+        """
         self.knowledge_file = Path(__file__).parent / "phase5_knowledge.json"
         self.state_file = Path(__file__).parent / ".oxproxion_phase5_state.json"
+        self._flush_every = flush_every
+        self._dirty_since_flush = 0
         self._load_state()
 
+        # Counter updates are buffered; make sure they hit disk on exit
+        flush_on_exit(self)
+
     def _load_state(self) -> None:
         """Load oxproxion's Phase 5 state."""
         if self.state_file.exists():
-            with open(self.state_file) as f:
-                self.state = json.load(f)
+            self.state = json_loads(self.state_file.read_bytes())
         else:
             self.state = {
                 "initialized": False,
@@ -41,8 +54,24 @@ class OxproxionPhase5Client:
 
     def _save_state(self) -> None:
         """Save oxproxion's Phase 5 state."""
-        with open(self.state_file, "w") as f:
-            json.dump(self.state, f, indent=2)
+        atomic_write_bytes(self.state_file, json_dumps(self.state, pretty=True))
+        self._dirty_since_flush = 0
+
+    def _mark_dirty(self) -> None:
+        """Note a state change, rewriting the file every flush_every changes."""
+        self._dirty_since_flush += 1
+        if self._dirty_since_flush >= self._flush_every:
+            self._save_state()
+
+    def flush(self) -> None:
+        """Write buffered state changes to disk, if there are any."""
+        if self._dirty_since_flush:
+            self._save_state()
+
+    def __del__(self) -> None:
+        # Collected before exit: don't lose buffered updates (best effort)
+        with contextlib.suppress(Exception):
+            self.flush()
 
     def import_omnilore_knowledge(self) -> Dict[str, Any]:
         """Import OmniLore knowledge into oxproxion.
@@ -55,12 +84,19 @@ class OxproxionPhase5Client:
                 f"phase5_knowledge.json not found at {self.knowledge_file}"
             )
 
-        with open(self.knowledge_file) as f:
-            data = json.load(f)
+        with open(self.knowledge_file, "rb") as f:
+            data = json_loads(f.read())
 
         entries = data.get("entries", [])
         print(f"\n📚 Importing {len(entries)} OmniLore knowledge entries...")
 
+        # Gather the summary figures in one pass over the entries
+        conf_sum = 0.0
+        categories = set()
+        for entry in entries:
+            conf_sum += entry.get("confidence", 0)
+            categories.add(entry.get("category"))
+
         # In a real implementation, this would:
         # 1. Initialize ChromaDB connection
         # 2. Create omnilore_tribal_knowledge collection
@@ -74,10 +110,8 @@ class OxproxionPhase5Client:
 
         return {
             "imported_entries": len(entries),
-            "average_confidence": (
-                sum(e.get("confidence", 0) for e in entries) / len(entries)
-            ),
-            "categories": len(set(e.get("category") for e in entries)),
+            "average_confidence": conf_sum / len(entries) if entries else 0.0,
+            "categories": len(categories),
             "status": "ready",
         }
 
@@ -88,7 +122,7 @@ class OxproxionPhase5Client:
             direction: "oxproxion→omnilore" or "omnilore→oxproxion"
         """
         self.state["syncs_with_omnilore"] += 1
-        self._save_state()
+        self._mark_dirty()
 
     def solve_local_problem(self, problem: str, problem_type: str) -> Dict[str, Any]:
         """Solve a problem using oxproxion's local knowledge.
@@ -101,7 +135,7 @@ class OxproxionPhase5Client:
             Solution metadata
         """
         self.state["problems_solved_locally"] += 1
-        self._save_state()
+        self._mark_dirty()
 
         return {
             "problem": problem,
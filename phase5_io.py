@@ -0,0 +1,153 @@
+"""
+Phase 5 I/O helpers shared by the federation, import, export and state modules.
+
+- JSON encoding/decoding, using orjson when it is installed
+- UTC ISO-8601 timestamp formatting, the one convention for all output
+- Atomic file replacement: every state file and export is written to a
+  sibling temp file and renamed into place, so a crash mid-write never
+  leaves a truncated file behind
+- Flush-on-exit registration for objects that buffer state in memory,
+  plus an opt-in SIGTERM hook for script entry points
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import secrets
+import signal
+import stat
+import traceback
+import weakref
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
+
+def json_dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to compact JSON bytes (2-space indented if pretty).
+
+    No trailing newline is added; callers writing whole files append it.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def json_loads(data) -> Any:
+    """Parse JSON from bytes or any bytes-like object (e.g. a memoryview)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def ns_to_iso(ts_ns: int) -> str:
+    """Format a time.time_ns() timestamp as a UTC ISO-8601 string."""
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).isoformat()
+
+
+def _create_sibling_temp(path: Path) -> Tuple[Path, int]:
+    """Create a new, uniquely named temp file beside path.
+
+    Created with mode 0666 so the kernel applies the process umask, just
+    as open(path, "w") would; the umask itself is never touched.
+
+    Returns:
+        (temp file path, file descriptor open for writing)
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp = path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+        try:
+            return tmp, os.open(tmp, flags, 0o666)
+        except FileExistsError:
+            continue  # Name collision; draw another
+
+
+@contextlib.contextmanager
+def atomic_writer(path) -> Iterator[BinaryIO]:
+    """Open a binary temp file that replaces path when the block exits cleanly.
+
+    The temp file is flushed and fsynced before the rename. It keeps the
+    permission bits of the file it replaces; a new file gets the
+    umask-default mode. If the block raises, the temp file is removed
+    and path is left untouched.
+
+    Args:
+        path: Destination file (its parent directory must exist)
+
+    Yields:
+        The temp file, open for binary writing
+    """
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None
+    tmp, fd = _create_sibling_temp(path)
+    with os.fdopen(fd, "wb") as f:
+        try:
+            yield f
+            f.flush()
+            if mode is not None:
+                os.chmod(tmp, mode)
+            os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            os.unlink(tmp)
+            raise
+    os.replace(tmp, path)
+
+
+def atomic_write_bytes(path, data: bytes) -> None:
+    """Atomically replace path's contents with data (see atomic_writer)."""
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+# Objects to flush at interpreter exit; weak, so registering never leaks
+_FLUSH_ON_EXIT: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def flush_on_exit(obj) -> None:
+    """Call obj.flush() at interpreter exit, if obj is still alive then.
+
+    Only a weak reference is kept, so registered objects can still be
+    garbage collected.
+    """
+    _FLUSH_ON_EXIT.add(obj)
+
+
+@atexit.register
+def _flush_all() -> None:
+    """Flush every live registered object; one failure doesn't stop the rest."""
+    for obj in list(_FLUSH_ON_EXIT):
+        try:
+            obj.flush()
+        except Exception:
+            traceback.print_exc()
+
+
+def _flush_and_reraise(signum, frame) -> None:
+    """Flush registered objects, then die from the signal as if unhandled."""
+    _flush_all()
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+def install_sigterm_flush() -> None:
+    """Flush flush_on_exit objects on SIGTERM, then terminate as usual.
+
+    Opt-in, for script entry points only: library code must not claim
+    process-wide signals. Does nothing if SIGTERM already has a handler.
+    Must be called from the main thread.
+    """
+    if signal.getsignal(signal.SIGTERM) is signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, _flush_and_reraise)